@@ -0,0 +1,139 @@
+# benchmarks/bench_readers.py - 엑셀 읽기 엔진 비교 (openpyxl vs calamine)
+#
+# 사용법:
+#   python benchmarks/bench_readers.py                 # 합성 카드 명세서로 비교
+#   python benchmarks/bench_readers.py a.xlsx b.xlsx   # 실제 명세서로 비교
+#
+# 엔진별 워크북 로딩 시간(최소값)과, 같은 파일을 파싱한 결과가 엔진과 무관하게 동일한지 확인합니다.
+# calamine 엔진 비교에는 python-calamine 설치가 필요합니다 (pip install python-calamine).
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_parsers import detect_card_issuer, parse_card_file  # noqa: E402
+from workbook import READERS, Workbook  # noqa: E402
+
+REPEAT = 3
+MERCHANTS = ["스타벅스 강남점", "GS25 역삼점", "티머니 택시", "쿠팡", "서울대병원", "SKT 통신요금", "한솥 도시락"]
+
+
+# ✅ 합성 명세서 생성 (국민카드 / 삼성카드 승인내역 형태)
+def make_statements(directory: str, rows: int) -> list:
+    from openpyxl import Workbook as XlsxWorkbook
+
+    start = datetime.datetime(2024, 1, 1)
+    paths = []
+
+    wb = XlsxWorkbook(write_only=True)
+    ws = wb.create_sheet("이용내역")
+    for _ in range(6):
+        ws.append(["국민카드 이용내역"])
+    ws.append(["이용일", "이용하신곳", "이용카드명", "국내이용금액\n(원)", "결제방법", "상태"])
+    for i in range(rows):
+        ws.append([
+            start + datetime.timedelta(hours=i), random.choice(MERCHANTS), "KB국민 노리카드",
+            f"{random.randint(1, 500) * 100:,}", random.choice(["일시불", "3개월", "일시불"]), "전표매입",
+        ])
+    paths.append(os.path.join(directory, f"kb_{rows}.xlsx"))
+    wb.save(paths[-1])
+
+    wb = XlsxWorkbook(write_only=True)
+    ws = wb.create_sheet("승인내역")
+    ws.append(["삼성카드 승인내역"])
+    ws.append([])
+    ws.append(["승인일자", "승인시각", "가맹점명", "승인금액(원)", "승인번호"])
+    for i in range(rows):
+        day = start + datetime.timedelta(hours=i)
+        ws.append([int(day.strftime("%Y%m%d")), day.strftime("%H:%M"), random.choice(MERCHANTS),
+                   random.randint(1, 500) * 100, 10000000 + i])
+    paths.append(os.path.join(directory, f"samsung_{rows}.xlsx"))
+    wb.save(paths[-1])
+    return paths
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def load_all(data: bytes, engine: str):
+    book = Workbook(data, engine=engine)
+    try:
+        for name in book.sheet_names:
+            book.rows(name)
+    finally:
+        book.close()
+
+
+def parse_with(data: bytes, engine: str):
+    book = Workbook(data, engine=engine)
+    try:
+        detection = detect_card_issuer(book)
+        return parse_card_file(book, detection) if detection else None
+    finally:
+        book.close()
+
+
+def available_engines() -> list:
+    probe = make_probe()
+    engines = []
+    for name, reader in READERS.items():
+        try:
+            reader(probe).close()
+            engines.append(name)
+        except ImportError:
+            print(f"[건너뜀] {name} 엔진이 설치되어 있지 않습니다.")
+    return engines
+
+
+def make_probe() -> bytes:
+    from io import BytesIO
+    from openpyxl import Workbook as XlsxWorkbook
+
+    output = BytesIO()
+    XlsxWorkbook().save(output)
+    return output.getvalue()
+
+
+def main(paths: list):
+    engines = available_engines()
+    print(f"{'파일':<24}{'엔진':<12}{'로딩(초)':>10}{'배속':>8}  결과 일치")
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.basename(path)
+
+        baseline = best_of(lambda: pd.read_excel(path, sheet_name=None, header=None))
+        print(f"{name:<24}{'read_excel':<12}{baseline:>10.3f}{1.0:>8.1f}  -")
+
+        reference = None
+        for engine in engines:
+            elapsed = best_of(lambda: load_all(data, engine))
+            parsed = parse_with(data, engine)
+            if reference is None:
+                reference, same = parsed, "기준"
+            elif parsed is None or reference is None:
+                same = "예" if parsed is None and reference is None else "아니오"
+            else:
+                same = "예" if parsed.equals(reference) else "아니오"
+            print(f"{name:<24}{engine:<12}{elapsed:>10.3f}{baseline / elapsed:>8.1f}  {same}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(sys.argv[1:])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            main(make_statements(tmp, rows=20_000))
@@ -0,0 +1,81 @@
+# card_categories.py - 사용처 자동 카테고리 분류 엔진
+
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CATEGORY = "잡비용"
+MEMO_SIZE = 50_000
+
+# ✅ 분류 규칙 파일 (위에 있을수록 우선, 수정하면 재배포 없이 자동 반영)
+RULES_PATH = Path(__file__).with_name("category_rules.json")
+
+
+class Categorizer:
+    def __init__(self, rules, default: str = DEFAULT_CATEGORY, memo_size: int = MEMO_SIZE, version=None):
+        self.version = version
+        self.categories = [category for _, category in rules]
+        self.default = default
+        # 규칙마다 "문자열 어딘가에 일치" 전방탐색을 두고 순서대로 결합 →
+        # 첫 번째로 성공한 분기가 곧 우선순위가 가장 높은 규칙 (기존 re.search 순회와 동일)
+        branches = "|".join(f"(?=.*?(?:{pattern}))(?P<r{i}>)" for i, (pattern, _) in enumerate(rules))
+        self.matcher = re.compile(branches, re.IGNORECASE | re.DOTALL) if rules else None
+        # 같은 사용처는 한 번만 분류 (재실행 간에도 유지되는 제한 크기 메모)
+        self.categorize = lru_cache(maxsize=memo_size)(self._categorize)
+
+    def _categorize(self, merchant: str) -> str:
+        match = self.matcher.match(merchant) if self.matcher else None
+        if match is None:
+            return self.default
+        return self.categories[int(match.lastgroup[1:])]
+
+    # ✅ 고유 사용처만 분류한 뒤 행 전체에 다시 펼침
+    def categorize_series(self, merchants: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(merchants.astype(str))
+        labels = np.array([self.categorize(m) for m in uniques], dtype=object)
+        return pd.Series(labels[codes], index=merchants.index)
+
+
+# ✅ 규칙 파일 읽기 → 컴파일된 분류기
+def load_categorizer(path=RULES_PATH) -> Categorizer:
+    version = os.stat(path).st_mtime_ns
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    rules = [(rule["pattern"], rule["category"]) for rule in data["rules"]]
+    return Categorizer(rules, data.get("default", DEFAULT_CATEGORY), version=version)
+
+
+# ✅ 서버 프로세스 전체가 공유하는 분류기 (파일 mtime이 바뀔 때만 다시 컴파일)
+_CATEGORIZER = None
+_FAILED_VERSION = None
+_LOCK = threading.Lock()
+
+def get_categorizer(path=RULES_PATH) -> Categorizer:
+    global _CATEGORIZER, _FAILED_VERSION
+    try:
+        version = os.stat(path).st_mtime_ns
+    except OSError as e:
+        # 규칙 파일이 잠시 없어지거나(편집기 저장 중 등) 읽을 수 없으면 이전 분류기를 계속 사용
+        if _CATEGORIZER is None:
+            raise
+        print("[ERROR] 카테고리 규칙 파일 확인 실패, 이전 규칙 유지:", e)
+        return _CATEGORIZER
+    if _CATEGORIZER is not None and version in (_CATEGORIZER.version, _FAILED_VERSION):
+        return _CATEGORIZER
+    with _LOCK:
+        if _CATEGORIZER is None or version not in (_CATEGORIZER.version, _FAILED_VERSION):
+            try:
+                _CATEGORIZER = load_categorizer(path)
+            except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+                # 잘못 수정된 규칙 파일이면 이전 분류기를 계속 사용
+                if _CATEGORIZER is None:
+                    raise
+                _FAILED_VERSION = version
+                print("[ERROR] 카테고리 규칙 파일 오류, 이전 규칙 유지:", e)
+    return _CATEGORIZER
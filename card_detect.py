@@ -0,0 +1,66 @@
+# card_detect.py - 카드사 헤더 자동 인식 (헤더 토큰 역색인)
+
+from typing import NamedTuple, Optional
+
+from card_layouts import LAYOUTS
+
+SNIFF_ROWS = 100
+
+
+def normalize_header(text) -> str:
+    return str(text).replace('\n', '').replace('\r', '').replace(' ', '').strip()
+
+
+# ✅ 인식 결과 (layout은 LAYOUTS 순번, 헤더 행 번호는 시트 기준 0부터)
+class Detection(NamedTuple):
+    issuer: str
+    layout: int
+    sheet: str
+    header_row: int
+    score: float
+
+
+class IssuerDetector:
+    def __init__(self, layouts: list):
+        # 레이아웃 목록과 "정규화 토큰 → 레이아웃 번호" 역색인을 한 번만 구성
+        self.layouts = []
+        self.index = {}
+        for layout_id, layout in enumerate(layouts):
+            tokens = frozenset(normalize_header(k) for k in layout["headers"])
+            self.layouts.append((layout["issuer"], tokens))
+            for token in tokens:
+                self.index.setdefault(token, []).append(layout_id)
+
+    # ✅ 한 행의 셀을 한 번만 훑어 레이아웃별 일치 키워드 수를 집계
+    def match_row(self, row) -> Optional[tuple]:
+        hits = {}
+        seen = set()
+        for cell in row:
+            if cell is None or cell == "" or cell != cell:
+                continue
+            token = normalize_header(cell)
+            if not token or token in seen:
+                continue
+            seen.add(token)
+            for layout_id in self.index.get(token, ()):
+                hits[layout_id] = hits.get(layout_id, 0) + 1
+
+        matched = [lid for lid, count in hits.items() if count == len(self.layouts[lid][1])]
+        if not matched:
+            return None
+        layout_id = min(matched)
+        # 신뢰도: 헤더 행의 셀 중 레이아웃 키워드가 차지하는 비율
+        score = len(self.layouts[layout_id][1]) / len(seen)
+        return layout_id, score
+
+    def detect(self, book, limit: int = SNIFF_ROWS) -> Optional[Detection]:
+        for sheet in book.sheet_names:
+            for row_number, row in enumerate(book.iter_rows(sheet, limit=limit)):
+                match = self.match_row(row)
+                if match:
+                    layout_id, score = match
+                    return Detection(self.layouts[layout_id][0], layout_id, sheet, row_number, score)
+        return None
+
+
+DETECTOR = IssuerDetector(LAYOUTS)
@@ -0,0 +1,127 @@
+# card_export.py - 카드 통합내역 엑셀 내보내기 (write-only 스트리밍 + 공용 이름 스타일)
+
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.worksheet.page import PageMargins
+from openpyxl.worksheet.properties import PageSetupProperties, WorksheetProperties
+
+from card_summary import build_cube, rollup
+from disk_cache import DiskCache
+
+# ✅ 내보내기 형식/서식을 바꾸면 올릴 것 (디스크에 남은 이전 결과물 무효화)
+EXPORT_VERSION = 2
+EXPORT_CACHE = DiskCache("exports", 256 * 1024 * 1024)
+
+CARD_LIST = ["국민카드", "현대카드", "롯데카드", "삼성카드", "하나카드", "신한카드"]
+COLOR_MAP_CARD = {
+    "국민카드": "FBE2D5", "현대카드": "DDEBF7", "롯데카드": "CCCCFF",
+    "삼성카드": "E2EFDA", "하나카드": "FFF2CC", "신한카드": "DDD9C4",
+}
+COLOR_MAP_CATEGORY = {
+    "교통/주유/주차": "CCFFCC", "병원/약국": "FFCC99",
+    "취미/쇼핑": "FFF2CC", "음식점/카페/편의점": "FFCCCC",
+    "고정지출": "C6E0B4", "잡비용": "E7E6E6",
+}
+DEFAULT_COLOR = "E7E6E6"
+COLUMN_WIDTHS = {"A": 11, "B": 11, "C": 20, "D": 40, "E": 15, "F": 3, "G": 18, "H": 12, "I": 3}
+
+THIN = Side(style="thin")
+THIN_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+WHITE_BOLD = Font(color="FFFFFF", bold=True)
+CENTER = Alignment(horizontal="center", vertical="center")
+LEFT = Alignment(horizontal="left", vertical="center")
+RIGHT = Alignment(horizontal="right", vertical="center")
+BLACK = PatternFill("solid", fgColor="000000")
+
+
+# ✅ 워크북에 한 번만 등록하는 이름 스타일 (셀마다 스타일 객체를 만들지 않음)
+def _register_styles(wb: Workbook):
+    styles = [
+        NamedStyle("헤더", font=WHITE_BOLD, fill=BLACK, alignment=CENTER, border=THIN_BORDER),
+        NamedStyle("통계헤더", font=WHITE_BOLD, fill=BLACK, alignment=CENTER),
+        NamedStyle("합계라벨", font=WHITE_BOLD, fill=BLACK, alignment=CENTER, border=THIN_BORDER),
+        NamedStyle("합계", font=WHITE_BOLD, fill=BLACK, alignment=CENTER, border=THIN_BORDER, number_format="#,##0"),
+        NamedStyle("본문", alignment=LEFT, border=THIN_BORDER),
+        NamedStyle("금액", alignment=RIGHT, border=THIN_BORDER, number_format="#,##0"),
+        NamedStyle("통계금액", border=THIN_BORDER, number_format="#,##0"),
+    ]
+    for color in {DEFAULT_COLOR, *COLOR_MAP_CARD.values(), *COLOR_MAP_CATEGORY.values()}:
+        fill = PatternFill("solid", fgColor=color)
+        styles.append(NamedStyle(f"본문_{color}", alignment=LEFT, border=THIN_BORDER, fill=fill))
+        styles.append(NamedStyle(f"통계_{color}", border=THIN_BORDER, fill=fill))
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def _cell(ws, value, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+# ✅ G/H 통계 블록 (행 번호 → [G셀, H셀])
+def _stat_block(ws, start_row: int, title: str, stats: pd.Series, color_map: dict) -> dict:
+    block = {start_row: [_cell(ws, title, "통계헤더"), _cell(ws, "금액", "통계헤더")]}
+    row_idx = start_row + 1
+    for key, amount in stats.items():
+        color = color_map.get(key, DEFAULT_COLOR)
+        block[row_idx] = [_cell(ws, key, f"통계_{color}"), _cell(ws, int(amount), "통계금액")]
+        row_idx += 1
+    block[row_idx] = [_cell(ws, "합계", "합계라벨"), _cell(ws, int(stats.sum()), "합계")]
+    return block
+
+
+# ✅ cube: card_summary.build_cube 결과 (없으면 여기서 집계)
+def ledger_xlsx(df: pd.DataFrame, cube: pd.DataFrame = None) -> bytes:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("카드내역")
+    _register_styles(wb)
+
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+    ws.sheet_view.showGridLines = False
+    ws.page_margins = PageMargins(left=0.5, right=0.5, top=0.75, bottom=0.75)
+    ws.sheet_properties = WorksheetProperties(pageSetUpPr=PageSetupProperties(fitToPage=True))
+
+    # 카테고리별 / 카드사별 통계는 요약 큐브에서 가져와 본문과 같은 행에 G/H 열로 함께 기록
+    if cube is None:
+        cube = build_cube(df)
+    by_category = rollup(cube, "카테고리")["합계"]
+    by_card = rollup(cube, "카드")["합계"].reindex(CARD_LIST, fill_value=0)
+    stats = _stat_block(ws, 1, "카테고리", by_category, COLOR_MAP_CATEGORY)
+    stats.update(_stat_block(ws, max(10, max(stats) + 2), "카드사", by_card, COLOR_MAP_CARD))
+
+    ws.append([_cell(ws, name, "헤더") for name in df.columns] + [None] + stats.get(1, []))
+
+    values = df.astype(object).where(df.notna(), None)
+    row_idx = 1
+    for row_idx, (date, card, category, merchant, amount) in enumerate(values.itertuples(index=False, name=None), start=2):
+        card_style = f"본문_{COLOR_MAP_CARD.get(card, DEFAULT_COLOR)}"
+        ws.append([
+            _cell(ws, date, card_style),
+            _cell(ws, card, card_style),
+            _cell(ws, category, f"본문_{COLOR_MAP_CATEGORY.get(category, DEFAULT_COLOR)}"),
+            _cell(ws, merchant, "본문"),
+            _cell(ws, amount, "금액"),
+            None,
+            *stats.get(row_idx, []),
+        ])
+
+    # 내역보다 통계 블록이 길면 남은 통계 행만 기록
+    for extra_row in range(row_idx + 1, max(stats) + 1):
+        ws.append([None] * 6 + stats.get(extra_row, []))
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+# ✅ 결과물 캐시 키: 업로드 파일 해시 + 파서/규칙 버전 + 내보내기 옵션 (DataFrame은 해시하지 않음)
+def export_key(digests: list, *options) -> str:
+    parts = [*digests, f"export-v{EXPORT_VERSION}", *map(str, options)]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
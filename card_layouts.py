@@ -0,0 +1,69 @@
+# card_layouts.py - 카드사별 엑셀 레이아웃 명세 (카드사 추가 = 아래 목록에 항목 추가)
+#
+# issuer       : 인식 결과로 표시할 카드사 이름
+# headers      : 헤더 행을 찾는 키워드 (공백/줄바꿈 무시, 목록 앞쪽 레이아웃이 우선)
+# columns      : 표준 열 ← 원본 헤더 (날짜/사용처/금액 필수, 카드/카테고리 선택)
+# card         : 카드 열이 없을 때 채울 카드 이름
+# cancel       : {원본 헤더: 정규식} 일치하는 행은 취소 건으로 제외
+# date_format  : None(엑셀 날짜·일련번호·문자열 자동) / "serial"(문자열 속 첫 숫자) / strptime 형식
+# installments : 할부 개월 수가 적힌 원본 헤더 (있으면 월 납입액으로 환산)
+
+LAYOUTS = [
+    {
+        "issuer": "롯데카드",
+        "headers": ["이용일자", "이용가맹점", "업종", "이용금액"],
+        "columns": {"날짜": "이용일자", "사용처": "이용가맹점", "카테고리": "업종", "금액": "이용금액"},
+        "card": "롯데카드",
+        "cancel": {"취소여부": r"(?i)^\s*Y\s*$"},
+    },
+    {
+        "issuer": "KB국민카드",
+        "headers": ["이용일", "이용하신곳", "이용카드명", "국내이용금액(원)"],
+        "columns": {"날짜": "이용일", "사용처": "이용하신곳", "카드": "이용카드명", "금액": "국내이용금액(원)"},
+        "cancel": {"상태": "승인취소|취소전표"},
+        "installments": "결제방법",
+    },
+    {
+        "issuer": "신한카드",
+        "headers": ["거래일자", "이용가맹점", "거래금액"],
+        "columns": {"날짜": "거래일자", "사용처": "이용가맹점", "금액": "결제금액"},
+        "card": "신한카드",
+    },
+    {
+        "issuer": "현대카드",
+        "headers": ["이용일", "이용가맹점", "이용금액"],
+        "columns": {"날짜": "이용일", "사용처": "이용가맹점", "금액": "이용금액"},
+        "card": "현대카드",
+        "date_format": "serial",
+    },
+    # 삼성카드 승인내역
+    {
+        "issuer": "삼성카드",
+        "headers": ["승인일자", "승인시각", "가맹점명", "승인금액(원)"],
+        "columns": {"날짜": "승인일자", "사용처": "가맹점명", "금액": "승인금액(원)"},
+        "card": "삼성카드",
+        "date_format": "%Y%m%d",
+    },
+    # 삼성카드 리볼빙
+    {
+        "issuer": "삼성카드",
+        "headers": ["이용일자", "카드번호", "사용처/가맹점", "이용금액"],
+        "columns": {"날짜": "이용일자", "사용처": "사용처/가맹점", "금액": "이용금액"},
+        "card": "삼성카드",
+        "date_format": "%Y%m%d",
+    },
+    # 삼성카드 연회비
+    {
+        "issuer": "삼성카드",
+        "headers": ["이용일자", "사용처/가맹점", "결제예정금액"],
+        "columns": {"날짜": "이용일자", "사용처": "사용처/가맹점", "금액": "결제예정금액"},
+        "card": "삼성카드",
+        "date_format": "%Y%m%d",
+    },
+    {
+        "issuer": "하나카드",
+        "headers": ["거래일자", "가맹점명", "이용금액"],
+        "columns": {"날짜": "거래일자", "사용처": "가맹점명", "금액": "이용금액"},
+        "card": "하나카드",
+    },
+]
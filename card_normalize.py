@@ -0,0 +1,74 @@
+# card_normalize.py - 금액 / 날짜 / 할부 열 단위 정규화 (행 단위 apply 없이 벡터 연산)
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_datetime64_any_dtype, is_numeric_dtype
+
+EXCEL_EPOCH = "1899-12-30"
+SERIAL = "serial"
+DATE_FORMAT = "%Y.%m.%d"
+
+
+# ✅ 문자열 / 숫자 셀 위치 (대부분 한 가지 타입이라 열 단위로 판별, 혼합형 열만 원소 단위)
+def _cell_masks(series: pd.Series) -> tuple:
+    none = pd.Series(False, index=series.index)
+    kind = infer_dtype(series, skipna=True)
+    if kind == "string":
+        return series.notna(), none
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        return none, series.notna()
+    if kind.startswith("mixed"):
+        types = series.map(type)
+        return types.eq(str), types.isin([int, float])
+    return none, none
+
+
+# ✅ 금액: 쉼표 제거 후 숫자로 (숫자가 아니면 NaN)
+def to_amount(series: pd.Series) -> pd.Series:
+    if is_numeric_dtype(series):
+        return series.astype(float)
+    cleaned = series.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce").astype(float)
+
+
+# ✅ 엑셀 일련번호 → 날짜
+def from_serial(numbers: pd.Series) -> pd.Series:
+    return pd.to_datetime(numbers, errors="coerce", unit="D", origin=EXCEL_EPOCH)
+
+
+# ✅ 날짜 열 변환
+#   fmt=None    : 숫자 셀은 엑셀 일련번호, 나머지는 일반 날짜 해석 (safe_excel_date 확장)
+#   fmt=SERIAL  : 문자열에 섞인 첫 숫자 또는 숫자 셀을 일련번호로 해석 (현대카드)
+#   fmt="%Y%m%d" 등 : 문자열로 바꾼 뒤 지정 형식으로 해석
+def to_date(series: pd.Series, fmt=None) -> pd.Series:
+    if is_datetime64_any_dtype(series):
+        return series
+    if is_numeric_dtype(series) and fmt in (None, SERIAL):
+        return from_serial(series)
+
+    is_text, is_number = _cell_masks(series)
+    numbers = pd.to_numeric(series.where(is_number), errors="coerce")
+    if fmt == SERIAL:
+        first = series.where(is_text).astype(str).str.extract(r"(\d+)", expand=False)
+        return from_serial(pd.to_numeric(first, errors="coerce").fillna(numbers))
+    if fmt:
+        return pd.to_datetime(series.astype(str), errors="coerce", format=fmt)
+
+    dates = pd.to_datetime(series.where(~is_number), errors="coerce")
+    return dates.fillna(from_serial(numbers))
+
+
+def format_date(dates: pd.Series) -> pd.Series:
+    return dates.dt.strftime(DATE_FORMAT)
+
+
+# ✅ 할부 개월 수: '일시불'이거나 숫자가 없으면 1, 그 외에는 문자열의 숫자 전체
+def installment_months(method: pd.Series) -> pd.Series:
+    text = method.astype(str)
+    digits = pd.to_numeric(text.str.replace(r"\D", "", regex=True), errors="coerce")
+    return digits.where((text != "일시불") & (digits > 0), 1).astype(int)
+
+
+# ✅ 할부 금액은 월 납입액으로 나눠 반올림
+def split_installments(amount: pd.Series, method: pd.Series) -> pd.Series:
+    months = installment_months(method)
+    return amount.where(months == 1, (amount / months).round())
@@ -0,0 +1,99 @@
+# card_parsers.py - 카드사 인식/파싱 (프로세스 풀 워커에서도 import 가능하도록 페이지와 분리)
+
+from operator import itemgetter
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from card_detect import DETECTOR, Detection, normalize_header
+from card_layouts import LAYOUTS
+from card_normalize import format_date, split_installments, to_amount, to_date
+import statement_cache
+from workbook import Workbook, content_hash
+
+# ✅ 레이아웃 / 정규화 / 파싱 엔진을 바꾸면 올릴 것 (명세서 캐시 무효화)
+PARSER_VERSION = 1
+
+# ✅ 카드사 자동 인식
+def detect_card_issuer(book: Workbook) -> Optional[Detection]:
+    try:
+        return DETECTOR.detect(book)
+    except Exception as e:
+        print("[ERROR] detect_card_issuer 예외 발생:", e)
+        return None
+
+# ✅ 인식된 레이아웃으로 파싱 (모든 카드사 공통 엔진)
+def parse_card_file(book: Workbook, detection: Detection) -> Optional[pd.DataFrame]:
+    try:
+        return parse_layout(book, LAYOUTS[detection.layout], detection.sheet, detection.header_row)
+    except Exception as e:
+        print("[ERROR] parse_card_file 예외 발생:", e)
+        return None
+
+def parse_layout(book: Workbook, layout: dict, sheet, header_row: int) -> Optional[pd.DataFrame]:
+    rows = book.rows(sheet)
+    position = {}
+    for idx, cell in enumerate(rows[header_row]):
+        position.setdefault(normalize_header(cell), idx)
+
+    columns = layout["columns"]
+    if not all(source in position for source in columns.values()):
+        return None
+
+    # 명세에 적힌 열만 골라 읽기 (취소 여부 / 할부 열은 있을 때만)
+    cancel = {k: v for k, v in layout.get("cancel", {}).items() if k in position}
+    installments = layout.get("installments") if layout.get("installments") in position else None
+    names = list(dict.fromkeys([*columns.values(), *cancel, *([installments] if installments else [])]))
+    body = rows[header_row + 1:]
+    if not body:
+        return None
+    frame = pd.DataFrame.from_records(map(itemgetter(*[position[n] for n in names]), body), columns=names)
+    frame = frame.where(frame.ne(""))
+
+    for source, pattern in cancel.items():
+        frame = frame[~frame[source].astype(str).str.contains(pattern, na=False)]
+
+    dates = to_date(frame[columns["날짜"]], layout.get("date_format"))
+    frame, dates = frame[dates.notna()], dates[dates.notna()]
+
+    amounts = to_amount(frame[columns["금액"]])
+    if installments:
+        amounts = split_installments(amounts, frame[installments])
+
+    df = pd.DataFrame({
+        "날짜": format_date(dates),
+        "카드": frame[columns["카드"]] if "카드" in columns else layout.get("card", layout["issuer"]),
+        "카테고리": frame[columns["카테고리"]] if "카테고리" in columns else "",
+        "사용처": frame[columns["사용처"]],
+        "금액": amounts,
+    })
+    return df.reset_index(drop=True)
+
+# ✅ 업로드 1건 처리 결과
+class IngestResult(NamedTuple):
+    issuer: Optional[str]
+    df: Optional[pd.DataFrame]
+
+# ✅ 디스크 캐시 조회 (같은 명세서를 다시 올리면 파싱 생략, 이미 구한 해시가 있으면 재사용)
+def lookup(data: bytes, digest: Optional[str] = None) -> Optional[IngestResult]:
+    cached = statement_cache.load(digest or content_hash(data), PARSER_VERSION)
+    return IngestResult(*cached) if cached else None
+
+# ✅ 파일 1건 인식 + 파싱 (프로세스 풀 워커 진입점, 엑셀 핸들은 이 호출 안에서만 쓰고 해제)
+def ingest(data: bytes, digest: Optional[str] = None) -> IngestResult:
+    digest = digest or content_hash(data)
+    cached = statement_cache.load(digest, PARSER_VERSION)
+    if cached:
+        return IngestResult(*cached)
+
+    book = Workbook(data, digest)
+    try:
+        detection = detect_card_issuer(book)
+        if not detection:
+            return IngestResult(None, None)
+        df = parse_card_file(book, detection)
+    finally:
+        book.close()
+    if df is not None:
+        statement_cache.store(digest, PARSER_VERSION, detection.issuer, df)
+    return IngestResult(detection.issuer, df)
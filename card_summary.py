@@ -0,0 +1,35 @@
+# card_summary.py - 카테고리 × 카드 × 월 요약 큐브 (통합 내역을 한 번만 집계하고 화면/엑셀이 함께 사용)
+
+import pandas as pd
+
+DIMENSIONS = ["카테고리", "카드", "월"]
+MEASURES = ["합계", "건수", "평균"]
+
+
+def _with_mean(frame: pd.DataFrame) -> pd.DataFrame:
+    frame["평균"] = frame["합계"] / frame["건수"].where(frame["건수"] > 0)
+    return frame
+
+
+# ✅ 요약 큐브: (카테고리, 카드, 월) 별 합계 / 건수 / 평균 (월은 날짜 "YYYY.MM.DD"의 앞 7자리)
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    keys = df[["카테고리", "카드"]].assign(월=df["날짜"].astype(str).str[:7])
+    cube = df["금액"].groupby([keys[d] for d in DIMENSIONS], sort=True).agg(합계="sum", 건수="count")
+    return _with_mean(cube)
+
+
+# ✅ 큐브를 일부 차원으로 다시 합산 (평균은 합계/건수로 재계산해 원본 평균과 동일)
+def rollup(cube: pd.DataFrame, dims) -> pd.DataFrame:
+    dims = [dims] if isinstance(dims, str) else list(dims)
+    if not dims:
+        total = cube[["합계", "건수"]].sum().to_frame().T
+        return _with_mean(total)
+    return _with_mean(cube.groupby(level=dims, sort=True)[["합계", "건수"]].sum())
+
+
+# ✅ 피벗 표: 행 차원 × 열 차원 (열 차원이 없으면 한 열짜리 표)
+def pivot(cube: pd.DataFrame, rows: str, columns: str = None, measure: str = "합계") -> pd.DataFrame:
+    if columns is None or columns == rows:
+        return rollup(cube, rows)[[measure]]
+    table = rollup(cube, [rows, columns])[measure].unstack(columns)
+    return table.fillna(0) if measure != "평균" else table
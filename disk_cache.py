@@ -0,0 +1,75 @@
+# disk_cache.py - 로컬 디스크 캐시 (용량 상한 + 가장 오래 안 쓴 항목부터 제거)
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+DATA_DIR = Path(tempfile.gettempdir()) / "jeniapp"
+
+
+class DiskCache:
+    def __init__(self, name: str, max_bytes: int):
+        self.directory = DATA_DIR / name
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key: str, suffix: str = "") -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    # ✅ 적중 시 파일 경로 반환 (수정 시각을 갱신해 최근 사용으로 표시)
+    def get(self, key: str, suffix: str = "") -> Optional[Path]:
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    # ✅ write(임시 경로)로 기록 후 원자적으로 교체 → 용량 정리
+    def put(self, key: str, suffix: str, write: Callable) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key, suffix)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.evict()
+        return path
+
+    def put_bytes(self, key: str, suffix: str, data: bytes) -> Path:
+        return self.put(key, suffix, lambda tmp: tmp.write_bytes(data))
+
+    # ✅ 적중하면 저장된 바이트, 아니면 build()로 만들어 저장
+    def get_or_build(self, key: str, suffix: str, build: Callable) -> bytes:
+        path = self.get(key, suffix)
+        if path is not None:
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                pass
+        data = build()
+        self.put_bytes(key, suffix, data)
+        return data
+
+    # ✅ 총 용량이 상한을 넘으면 오래 안 쓴 파일부터 삭제
+    def evict(self):
+        with self._lock:
+            entries = []
+            for path in self.directory.iterdir():
+                if path.name.startswith("."):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
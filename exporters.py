@@ -0,0 +1,93 @@
+# exporters.py - 공용 내보내기 (CSV / Parquet / 엑셀, 모두 스트리밍 방식으로 기록)
+
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
+
+CHUNK_ROWS = 50_000
+
+
+# ✅ CSV: 청크 단위로 기록 (엑셀에서 한글이 깨지지 않도록 BOM 포함)
+def csv_bytes(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    df.to_csv(output, index=False, encoding="utf-8-sig", chunksize=CHUNK_ROWS)
+    return output.getvalue()
+
+
+# ✅ Parquet: 행 그룹 단위로 기록 (숫자/문자 혼합 열은 문자열로 저장)
+def parquet_bytes(df: pd.DataFrame) -> bytes:
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        mixed = {c: str for c in df.columns if df[c].dtype == object}
+        table = pa.Table.from_pandas(df.astype(mixed), preserve_index=False)
+    output = BytesIO()
+    pq.write_table(table, output, row_group_size=CHUNK_ROWS)
+    return output.getvalue()
+
+
+# ✅ 엑셀: write-only 모드로 행을 바로 기록 (헤더/본문 이름 스타일 2개만 사용)
+#   tables: DataFrame 하나(sheet_name 시트) 또는 {시트 이름: DataFrame} (표마다 시트 하나)
+def xlsx_bytes(tables, sheet_name: str = "Sheet1") -> bytes:
+    if isinstance(tables, pd.DataFrame):
+        tables = {sheet_name: tables}
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle("헤더", font=Font(bold=True), alignment=Alignment(horizontal="center")))
+    wb.add_named_style(NamedStyle("본문", alignment=Alignment(horizontal="left")))
+
+    for name, df in tables.items():
+        ws = wb.create_sheet(name)
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(ws, value=str(column))
+            cell.style = "헤더"
+            header.append(cell)
+        ws.append(header)
+
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+# ✅ 하이퍼링크 엑셀: 열 단위 목록을 한 번에 순회하며 기록
+#   링크 셀은 보이는 값(text) + 셀 하이퍼링크로 저장 (수식이 아니라 재계산 없이도 어떤 뷰어에서나 ID가 보임)
+def hyperlink_xlsx(texts, links, columns: dict, sheet_name: str = "Sheet1", header=None) -> bytes:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    wb.add_named_style(NamedStyle("헤더", font=Font(bold=True), alignment=Alignment(horizontal="left")))
+    wb.add_named_style(NamedStyle("본문", alignment=Alignment(horizontal="left")))
+    wb.add_named_style(NamedStyle(
+        "링크", font=Font(color="0563C1", underline="single"), alignment=Alignment(horizontal="left"),
+    ))
+
+    names = header or ["링크", *columns]
+    header_cells = []
+    for name in names:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.style = "헤더"
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for text, link, *values in zip(texts, links, *columns.values()):
+        link_cell = WriteOnlyCell(ws, value=text)
+        link_cell.hyperlink = link
+        link_cell.style = "링크"
+        row = [link_cell]
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = "본문"
+            row.append(cell)
+        ws.append(row)
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
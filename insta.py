@@ -0,0 +1,118 @@
+# insta.py - 인스타그램 ZIP 팔로워/팔로잉 수집 (샤드 파일 전체, JSON 항목 단위 스트리밍)
+
+import io
+import json
+import posixpath
+import re
+
+FOLLOWER_SHARD = re.compile(r"^followers(?:_(\d+))?\.json$")
+FOLLOWING_SHARD = re.compile(r"^following(?:_(\d+))?\.json$")
+CHUNK_CHARS = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+# ✅ ZIP 안의 샤드 파일 목록 (followers.json, followers_1.json, followers_2.json ... 번호순)
+def find_shards(zip_file, pattern: re.Pattern) -> list:
+    shards = []
+    for name in zip_file.namelist():
+        match = pattern.match(posixpath.basename(name))
+        if match:
+            shards.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(shards)]
+
+
+# ✅ 버퍼 하나로 JSON 값을 차례로 꺼내는 스트림 (파일 전체를 메모리에 올리지 않음)
+class _JsonStream:
+    def __init__(self, text, chunk_size: int = CHUNK_CHARS):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.text.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # 공백을 건너뛴 다음 글자 (끝이면 "")
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 위치에 '{self.peek()}'")
+        self.pos += 1
+
+    # 값 하나 디코드 (버퍼 끝에서 잘린 값이면 더 읽고 다시 시도)
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"JSON 형식 오류: 배열 안의 '{char}'")
+
+
+# ✅ 최상위 배열의 항목, 또는 최상위 객체 안 배열 값들의 항목을 하나씩 반환
+def iter_entries(raw, chunk_size: int = CHUNK_CHARS):
+    stream = _JsonStream(io.TextIOWrapper(raw, encoding="utf-8-sig"), chunk_size)
+    first = stream.peek()
+    if first == "[":
+        yield from stream.items()
+    elif first == "{":
+        stream.pos += 1
+        while stream.peek() != "}":
+            if stream.peek() == "":
+                raise ValueError("JSON 형식 오류: 객체가 닫히지 않음")
+            stream.value()
+            stream.expect(":")
+            if stream.peek() == "[":
+                yield from stream.items()
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+# ✅ 샤드 파일들의 (사용자명, 타임스탬프) (값이 없는 최신 형식은 title을 사용자명으로 사용)
+def iter_relations(zip_file, names: list):
+    for name in names:
+        with zip_file.open(name) as raw:
+            for entry in iter_entries(raw):
+                if not isinstance(entry, dict) or not entry.get("string_list_data"):
+                    continue
+                string_data = entry["string_list_data"][0]
+                username = string_data.get("value") or entry.get("title")
+                yield username, string_data.get("timestamp")
@@ -0,0 +1,135 @@
+# insta_snapshots.py - 팔로워/팔로잉 스냅샷 저장소 (사용자명 해시 정렬 배열 → 업로드 간 비교)
+#
+# 계정 이름과 사용자명은 그대로 저장하지 않고 blake2b 해시만 남김 (스냅샷 1개 ≈ 계정 수 × 8바이트)
+# 저장 위치는 "계정 이름 + 업로드한 사람만 아는 비밀번호"로 정해지므로 계정 이름만으로는 남의 기록에 접근할 수 없음
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from disk_cache import DATA_DIR
+
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+MAX_SNAPSHOTS = 50
+MIN_SECRET = 6
+OWNER_OVERLAP = 0.5
+
+
+# ✅ 사용자명 → uint64 해시 (입력 순서 유지)
+def _hash(names: list) -> np.ndarray:
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(str(n).encode("utf-8"), digest_size=8).digest(), "little") for n in names),
+        dtype=np.uint64, count=len(names),
+    )
+
+
+# ✅ 저장/비교용 해시 배열 (중복 제거 + 정렬)
+def hash_names(names) -> np.ndarray:
+    return np.unique(_hash(list(names)))
+
+
+class Snapshot(NamedTuple):
+    taken_at: int
+    digest: str
+    followers: np.ndarray
+    following: np.ndarray
+
+
+# ✅ 스냅샷 간 차이 (새로 언팔한 계정 / 새로 팔로우한 계정의 해시)
+#   same_owner: 두 업로드의 팔로잉 목록이 충분히 겹치는지 (아니면 다른 사람의 업로드로 보고 비교하지 않음)
+class SnapshotDiff(NamedTuple):
+    same_owner: bool
+    lost_followers: np.ndarray
+    new_followers: np.ndarray
+
+
+def same_owner(old: Snapshot, following: np.ndarray, threshold: float = OWNER_OVERLAP) -> bool:
+    smaller = min(len(old.following), len(following))
+    if not smaller:
+        return False
+    shared = len(np.intersect1d(old.following, following, assume_unique=True))
+    return shared / smaller >= threshold
+
+
+def diff(old: Snapshot, followers: np.ndarray, following: np.ndarray) -> SnapshotDiff:
+    empty = np.empty(0, dtype=np.uint64)
+    if not same_owner(old, following):
+        return SnapshotDiff(False, empty, empty)
+    return SnapshotDiff(
+        True,
+        np.setdiff1d(old.followers, followers, assume_unique=True),
+        np.setdiff1d(followers, old.followers, assume_unique=True),
+    )
+
+
+# ✅ 해시 → 이번 업로드에 있는 사용자명으로 되돌리기 (찾지 못한 해시 수도 함께 반환)
+def resolve(hashes: np.ndarray, names) -> tuple:
+    names = sorted(set(names))
+    mask = np.isin(_hash(names), hashes)
+    found = [n for n, hit in zip(names, mask) if hit]
+    return found, len(hashes) - len(found)
+
+
+class SnapshotStore:
+    def __init__(self, root: Path = SNAPSHOT_DIR, max_snapshots: int = MAX_SNAPSHOTS):
+        self.root = root
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+
+    # ✅ 저장 위치: 비밀번호를 키로 한 계정 이름 해시 (같은 계정 이름이라도 비밀번호가 다르면 다른 기록)
+    def _account_dir(self, account: str, secret: str) -> Path:
+        if len(secret) < MIN_SECRET:
+            raise ValueError(f"비밀번호는 {MIN_SECRET}자 이상이어야 합니다.")
+        key = hashlib.sha256(secret.encode("utf-8")).digest()
+        label = hashlib.blake2b(account.strip().lower().encode("utf-8"), key=key, digest_size=16).hexdigest()
+        return self.root / label
+
+    # ✅ 저장된 스냅샷 파일 (오래된 순, 파일명 = "촬영시각-업로드해시.npz")
+    def list(self, account: str, secret: str) -> list:
+        directory = self._account_dir(account, secret)
+        if not directory.is_dir():
+            return []
+        return sorted(p for p in directory.glob("*.npz") if not p.name.startswith("."))
+
+    def load(self, path: Path) -> Snapshot:
+        with np.load(path) as data:
+            return Snapshot(int(data["taken_at"]), str(data["digest"]), data["followers"], data["following"])
+
+    # ✅ 이번 업로드를 뺀 이전 스냅샷 (최신 순)
+    def previous(self, account: str, secret: str, digest: str) -> list:
+        return [p for p in reversed(self.list(account, secret)) if not p.stem.endswith(digest[:16])]
+
+    # ✅ 업로드 1건 저장 (해시 배열은 hash_names 결과, 같은 ZIP은 한 번만, 상한을 넘으면 오래된 스냅샷부터 삭제)
+    def save(self, account: str, secret: str, digest: str, followers: np.ndarray, following: np.ndarray,
+             taken_at: int = None) -> Path:
+        directory = self._account_dir(account, secret)
+        with self._lock:
+            for path in self.list(account, secret):
+                if path.stem.endswith(digest[:16]):
+                    return path
+
+            directory.mkdir(parents=True, exist_ok=True)
+            taken_at = int(taken_at or time.time())
+            path = directory / f"{taken_at:012d}-{digest[:16]}.npz"
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    np.savez_compressed(
+                        f, taken_at=np.int64(taken_at), digest=np.str_(digest),
+                        followers=followers, following=following,
+                    )
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+            for old in self.list(account, secret)[:-self.max_snapshots]:
+                old.unlink(missing_ok=True)
+        return path
+
+
+STORE = SnapshotStore()
@@ -0,0 +1,73 @@
+# ledger_view.py - 통합 내역 서버 측 필터 / 페이지 나누기 (열별 색인을 미리 만들어 두고 현재 페이지만 잘라 보냄)
+
+import numpy as np
+import pandas as pd
+
+
+class LedgerIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.size = len(self.df)
+
+        # 카드 / 카테고리: 값 → 행 위치 배열
+        self.by_card = self.df.groupby("카드", sort=True).indices
+        self.by_category = self.df.groupby("카테고리", sort=True).indices
+
+        # 날짜("YYYY.MM.DD" 문자열은 사전순 = 날짜순) / 금액: 정렬 배열 + 원래 행 위치
+        dates = self.df["날짜"].astype(str).to_numpy()
+        self.date_order = np.argsort(dates, kind="stable")
+        self.sorted_dates = dates[self.date_order]
+        amounts = self.df["금액"].to_numpy(dtype=float)
+        self.amount_order = np.argsort(amounts, kind="stable")
+        self.sorted_amounts = amounts[self.amount_order]
+
+    @property
+    def cards(self) -> list:
+        return list(self.by_card)
+
+    @property
+    def categories(self) -> list:
+        return list(self.by_category)
+
+    @property
+    def date_bounds(self) -> tuple:
+        if not self.size:
+            return None, None
+        return self.sorted_dates[0], self.sorted_dates[-1]
+
+    @property
+    def amount_bounds(self) -> tuple:
+        finite = self.sorted_amounts[~np.isnan(self.sorted_amounts)]
+        if not len(finite):
+            return 0.0, 0.0
+        return float(finite[0]), float(finite[-1])
+
+    def _members(self, index: dict, keys) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for key in keys:
+            mask[index.get(key, [])] = True
+        return mask
+
+    def _between(self, order: np.ndarray, values: np.ndarray, low, high) -> np.ndarray:
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    # ✅ 조건에 맞는 행 위치 (None인 조건은 적용하지 않음, 날짜는 "YYYY.MM.DD" 문자열)
+    def filter(self, cards=None, categories=None, date_range=(None, None), amount_range=(None, None)) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        if cards is not None:
+            mask &= self._members(self.by_card, cards)
+        if categories is not None:
+            mask &= self._members(self.by_category, categories)
+        if date_range != (None, None):
+            mask &= self._between(self.date_order, self.sorted_dates, *date_range)
+        if amount_range != (None, None):
+            mask &= self._between(self.amount_order, self.sorted_amounts, *amount_range)
+        return np.flatnonzero(mask)
+
+    # ✅ 현재 페이지 행만 잘라서 반환 (필터 결과 위치 중 start ~ stop)
+    def page(self, positions: np.ndarray, start: int, stop: int) -> pd.DataFrame:
+        return self.df.iloc[positions[start:stop]]
@@ -1,10 +1,19 @@
-# pages/audit.py (정산 도우미 v2)
+# pages/audit.py (정산 도우미 v9)
 
 import streamlit as st
 st.set_page_config(page_title="제니앱", page_icon="📊", layout="wide")
 
+import hashlib
 import pandas as pd
-from shared import show_menu
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from shared import show_menu, export_menu, process_pool
+from exporters import csv_bytes, parquet_bytes, xlsx_bytes
+from reconcile import (
+    KZ_COLUMNS, KZ_MISSING, MISMATCH, SNC_COLUMNS, SNC_MISSING,
+    consolidate, load_amounts as read_amounts, pair_files, parse_mapping, reconcile, reconcile_files,
+)
+from workbook import content_hash, read_bytes
 
 show_menu("정산 도우미")
 
@@ -24,6 +33,113 @@ st.markdown("""
    엑셀에서 파일을 연 뒤, 반드시 **[다른 이름으로 저장 → .xlsx] 형식으로 저장 후 업로드**해주세요.
 """)
 
+# ✅ 허용 오차: 정확히 맞지 않은 금액끼리 ±N원 또는 ±p% 안이면 짝지음 (둘 다 0이면 정확히 일치만)
+col1, col2 = st.columns(2)
+tolerance_won = col1.number_input("허용 오차 (±원)", min_value=0, value=0, step=10, format="%d")
+tolerance_pct = col2.number_input("허용 오차 (±%)", min_value=0.0, value=0.0, step=0.1, format="%.1f")
+
+mode = st.radio("처리 방식", ["파일 한 쌍", "여러 쌍 일괄 처리"], horizontal=True)
+
+# ✅ 일괄 처리: 쌍마다 프로세스 풀에서 대사 (결과는 짝지은 순서 유지)
+def reconcile_batch(jobs: list) -> list:
+    results = [None] * len(jobs)
+    progress = st.progress(0.0, text=f"대사 중... (0/{len(jobs)})")
+    try:
+        pool = process_pool()
+        futures = {
+            pool.submit(reconcile_files, kz_data, snc_data, tolerance_won, tolerance_pct): idx
+            for idx, (_, kz_data, snc_data) in enumerate(jobs)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            try:
+                results[idx] = (jobs[idx][0], future.result())
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                results[idx] = (jobs[idx][0], e)
+            progress.progress(done / len(jobs), text=f"📂 {jobs[idx][0]} 대사 완료 ({done}/{len(jobs)})")
+    except BrokenProcessPool:
+        # 워커 프로세스를 쓸 수 없는 환경이면 순차 처리로 전환
+        process_pool.clear()
+        results = []
+        for label, kz_data, snc_data in jobs:
+            try:
+                results.append((label, reconcile_files(kz_data, snc_data, tolerance_won, tolerance_pct)))
+            except Exception as e:
+                results.append((label, e))
+    progress.empty()
+    return results
+
+# ✅ 결과 내보내기: 엑셀은 표마다 시트 하나, CSV / Parquet는 고른 표 하나
+def export_tables(key: str, tables: dict, file_stem: str, token: str):
+    table = st.radio(
+        "CSV / Parquet로 받을 표 (엑셀은 모든 표를 시트별로 포함)", list(tables), horizontal=True, key=f"{key}_table",
+    )
+    export_menu(
+        key,
+        {
+            "xlsx": lambda: xlsx_bytes(tables),
+            "csv": lambda: csv_bytes(tables[table]),
+            "parquet": lambda: parquet_bytes(tables[table]),
+        },
+        file_stem,
+        token=f"{token}|{table}",
+    )
+
+if mode == "여러 쌍 일괄 처리":
+    st.write("담당자/지점별 KZ·SNC 파일을 한꺼번에 올리면 파일 이름으로 짝을 지어 한 번에 대사합니다. "
+             "(예: `KZ_홍길동.xlsx` ↔ `SNC_홍길동.xlsx`, 수동 입력 금액은 일괄 처리에 적용되지 않습니다)")
+    kz_files = st.file_uploader("KZ 엑셀 파일 업로드 (여러 개, .xlsx)", type=["xlsx"], accept_multiple_files=True, key="kz_batch")
+    snc_files = st.file_uploader("SNC 엑셀 파일 업로드 (여러 개, .xlsx)", type=["xlsx"], accept_multiple_files=True, key="snc_batch")
+    mapping_text = st.text_area("직접 짝 지정 (선택, 한 줄에 `KZ파일명 = SNC파일명`)", key="batch_mapping")
+
+    if kz_files and snc_files:
+        kz_by_name = {f.name: f for f in kz_files}
+        snc_by_name = {f.name: f for f in snc_files}
+        pairs, lone_kz, lone_snc = pair_files(list(kz_by_name), list(snc_by_name), parse_mapping(mapping_text))
+
+        st.dataframe(pd.DataFrame(pairs, columns=["담당", "KZ 파일", "SNC 파일"]), use_container_width=True)
+        if lone_kz:
+            st.warning(f"⚠️ 짝이 없는 KZ 파일: {', '.join(lone_kz)}")
+        if lone_snc:
+            st.warning(f"⚠️ 짝이 없는 SNC 파일: {', '.join(lone_snc)}")
+
+        jobs = [(label, read_bytes(kz_by_name[kz]), read_bytes(snc_by_name[snc])) for label, kz, snc in pairs]
+        batch_key = hashlib.sha256("|".join(
+            [f"{label}:{content_hash(kz_data)}:{content_hash(snc_data)}" for label, kz_data, snc_data in jobs]
+            + [str(tolerance_won), str(tolerance_pct)]
+        ).encode("utf-8")).hexdigest()
+
+        if pairs and st.button("🚀 일괄 대사 시작"):
+            st.session_state["audit_batch"] = (batch_key, reconcile_batch(jobs))
+
+        stored = st.session_state.get("audit_batch")
+        if stored and stored[0] == batch_key:
+            overview, batch_summary, batch_unmatched, batch_tolerance = consolidate(stored[1])
+
+            st.subheader(f"쌍별 요약 (총 {len(overview)}쌍)")
+            st.dataframe(
+                overview.style.format("{:,.0f}", subset=['KZ합계', 'SNC합계', '차액'], na_rep="-"),
+                use_container_width=True,
+            )
+            st.markdown(f"**🔢 KZ 합계:** {overview['KZ합계'].sum():,.0f} / **SNC 합계:** {overview['SNC합계'].sum():,.0f}"
+                        f" / **차액:** {overview['차액'].sum():,.0f}")
+
+            st.subheader(f"통합 비교 결과 (불일치 또는 누락 항목 총 {len(batch_summary)}건)")
+            st.dataframe(batch_summary, use_container_width=True)
+            st.subheader(f"통합 미대사 금액 (총 {len(batch_unmatched)}건)")
+            st.dataframe(batch_unmatched, use_container_width=True)
+            if len(batch_tolerance):
+                st.subheader(f"통합 허용 오차 일치 (총 {len(batch_tolerance)}쌍)")
+                st.dataframe(batch_tolerance, use_container_width=True)
+
+            batch_tables = {"쌍별 요약": overview, "비교 결과": batch_summary, "미대사 금액": batch_unmatched}
+            if len(batch_tolerance):
+                batch_tables["허용 오차 일치"] = batch_tolerance
+            export_tables("audit_batch", batch_tables, "제니앱_정산_도우미_일괄", batch_key)
+    st.stop()
+
 st.write("KZ와 SNC의 엑셀 파일을 업로드하여 MBL별 금액 비교 결과를 확인하세요.")
 
 file_kz = st.file_uploader("KZ 엑셀 파일 업로드 (.xlsx)", type=["xlsx"], key="kz")
@@ -32,71 +148,79 @@ file_snc = st.file_uploader("SNC 엑셀 파일 업로드 (.xlsx)", type=["xlsx"]
 # 이하 기존 코드 동일
 manual_kz = st.number_input("KZ 미승인 금액 수동 입력 (원)", min_value=0, value=0, step=10000, format="%d")
 
+# ✅ 업로드 → 표준 (MBL, 금액) 표 (내용 해시 기준 캐시, 필요한 열이 없으면 None)
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_amounts(digest: str, _data: bytes, columns: tuple):
+    return read_amounts(_data, columns, digest)
+
+# ✅ 대사 결과 캐시 (두 파일 해시 기준, 수동 입력 금액은 합계 줄에서만 반영)
+@st.cache_data(max_entries=8, show_spinner="KZ / SNC 대사 중...")
+def reconcile_uploads(kz_digest: str, snc_digest: str, tolerance_won: int, tolerance_pct: float,
+                      _kz: pd.DataFrame, _snc: pd.DataFrame):
+    return reconcile(_kz, _snc, tolerance_won, tolerance_pct)
+
 if file_kz and file_snc:
     try:
-        df_kz = pd.read_excel(file_kz)
-        df_snc = pd.read_excel(file_snc)
+        kz_data, snc_data = read_bytes(file_kz), read_bytes(file_snc)
+        kz_digest, snc_digest = content_hash(kz_data), content_hash(snc_data)
+        df_kz = load_amounts(kz_digest, kz_data, KZ_COLUMNS)
+        df_snc = load_amounts(snc_digest, snc_data, SNC_COLUMNS)
 
-        if not {'M.BL#', '승인금액'}.issubset(df_kz.columns):
+        if df_kz is None:
             st.error("❌ KZ 파일에 'M.BL#' 또는 '승인금액' 열이 없습니다.")
             st.stop()
-        if not {'H.B/L NO', 'Unnamed: 11'}.issubset(df_snc.columns):
+        if df_snc is None:
             st.error("❌ SNC 파일에 'H.B/L NO' 또는 'Unnamed: 11' 열이 없습니다.")
             st.stop()
 
-        df_kz = df_kz[['M.BL#', '승인금액']].copy()
-        df_kz.columns = ['MBL', '승인금액']
-        df_kz.dropna(subset=['MBL'], inplace=True)
-        df_kz['MBL'] = df_kz['MBL'].astype(str).str.strip()
-        df_kz['승인금액'] = pd.to_numeric(df_kz['승인금액'], errors='coerce').fillna(0)
-
-        df_snc = df_snc[['H.B/L NO', 'Unnamed: 11']].copy()
-        df_snc.columns = ['MBL', '금액_SNC']
-        df_snc.dropna(subset=['MBL'], inplace=True)
-        df_snc['MBL'] = df_snc['MBL'].astype(str).str.strip()
-        df_snc['금액_SNC'] = pd.to_numeric(df_snc['금액_SNC'], errors='coerce').fillna(0)
-
-        all_mbls = pd.Series(sorted(set(df_kz['MBL']) | set(df_snc['MBL'])), name='MBL')
-
-        kz_grouped = df_kz.groupby('MBL')['승인금액'].apply(lambda x: sorted(x.tolist())).reset_index()
-        snc_grouped = df_snc.groupby('MBL')['금액_SNC'].apply(lambda x: sorted(x.tolist())).reset_index()
-
-        compare_df = pd.merge(all_mbls.to_frame(), kz_grouped, on='MBL', how='left')
-        compare_df = pd.merge(compare_df, snc_grouped, on='MBL', how='left')
-
-        def compare_lists(kz_list, snc_list):
-            if not isinstance(kz_list, list): return 'KZ 미승인'
-            if not isinstance(snc_list, list): return 'SNC 미입력'
-            return '일치' if sorted(kz_list) == sorted(snc_list) else '금액 불일치'
-
-        compare_df['비고'] = compare_df.apply(lambda row: compare_lists(row['승인금액'], row['금액_SNC']), axis=1)
-        result_df = compare_df[compare_df['비고'] != '일치'].sort_values(by='MBL')
-        result_df.columns = ['MBL#', 'KZ금액', 'SNC금액', '비고']
+        # MBL별 금액을 (MBL, 금액, 순번) 키로 맞춰 보고 짝이 없는 금액만 남김
+        result = reconcile_uploads(kz_digest, snc_digest, tolerance_won, tolerance_pct, df_kz, df_snc)
+        result_df = result.summary
         result_df.insert(0, '번호', range(1, len(result_df) + 1))
 
-        kz_total = sum([sum(x) if isinstance(x, list) else 0 for x in compare_df['승인금액']]) + manual_kz
-        snc_total = sum([sum(x) if isinstance(x, list) else 0 for x in compare_df['금액_SNC']])
+        kz_total = result.kz_total + manual_kz
+        snc_total = result.snc_total
         diff = kz_total - snc_total
         st.markdown(f"**🔢 KZ 금액 합계:** {kz_total:,.0f} (수동 입력 포함)")
         st.markdown(f"**🔢 SNC 금액 합계:** {snc_total:,.0f}")
         st.markdown(f"**➖ 차액 (KZ - SNC):** {diff:,.0f}")
 
+        kz_columns = [result_df.columns.get_loc(c) for c in ('KZ건수', 'KZ합계')]
+        snc_columns = [result_df.columns.get_loc(c) for c in ('SNC건수', 'SNC합계')]
+
         def highlight(row):
             style = [''] * len(row)
-            if row['비고'] == '금액 불일치':
-                style[2] = 'background-color: #ffd6d6'
-                style[3] = 'background-color: #ffd6d6'
-            elif row['비고'] == 'KZ 미승인':
-                style[2] = 'background-color: #fff3cd'
-            elif row['비고'] == 'SNC 미입력':
-                style[3] = 'background-color: #d6eaff'
+            if row['비고'] == MISMATCH:
+                for i in kz_columns + snc_columns:
+                    style[i] = 'background-color: #ffd6d6'
+            elif row['비고'] == KZ_MISSING:
+                for i in kz_columns:
+                    style[i] = 'background-color: #fff3cd'
+            elif row['비고'] == SNC_MISSING:
+                for i in snc_columns:
+                    style[i] = 'background-color: #d6eaff'
             return style
 
         st.subheader(f"비교 결과 (불일치 또는 누락 항목 총 {len(result_df)}건)")
-        st.dataframe(result_df.style.apply(highlight, axis=1), use_container_width=True)
-
-        csv = result_df.to_csv(index=False).encode('utf-8-sig')
-        st.download_button("📅 엑셀파일 다운로드", data=csv, file_name="제니앱_정산_도우미.csv", mime="text/csv")
+        st.dataframe(
+            result_df.style.apply(highlight, axis=1).format("{:,.0f}", subset=['KZ합계', 'SNC합계', '차액']),
+            use_container_width=True,
+        )
+
+        st.subheader(f"미대사 금액 (짝이 없는 금액 총 {len(result.unmatched)}건)")
+        st.dataframe(result.unmatched.style.format("{:,.0f}", subset=['금액']), use_container_width=True)
+
+        if len(result.tolerance):
+            st.subheader(f"허용 오차 일치 (총 {len(result.tolerance)}쌍)")
+            st.dataframe(
+                result.tolerance.style.format("{:,.0f}", subset=['KZ금액', 'SNC금액', '차이']),
+                use_container_width=True,
+            )
+
+        tables = {"비교 결과": result_df, "미대사 금액": result.unmatched}
+        if len(result.tolerance):
+            tables["허용 오차 일치"] = result.tolerance
+        export_tables("audit", tables, "제니앱_정산_도우미", f"{kz_digest}|{snc_digest}|{tolerance_won}|{tolerance_pct}")
 
     except Exception as e:
         st.error(f"🚨 처리 중 오류가 발생했습니다: {str(e)}")
@@ -1,16 +1,15 @@
 # pages/check.py
 import streamlit as st
 st.set_page_config(page_title="제니앱", page_icon="📱", layout="wide")
-import json
 import pandas as pd
 import zipfile
 import io
 import datetime
-from io import BytesIO
-from shared import show_menu
-import openpyxl
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import Alignment
+from shared import show_menu, export_menu, page_controls
+from exporters import csv_bytes, hyperlink_xlsx, parquet_bytes
+from workbook import content_hash, read_bytes
+from insta import FOLLOWER_SHARD, FOLLOWING_SHARD, find_shards, iter_relations
+from insta_snapshots import MIN_SECRET, STORE, diff, hash_names, resolve, same_owner
 
 show_menu("인스타 언팔체크")
 
@@ -59,26 +58,6 @@ st.markdown("""
 uploaded_zip = st.file_uploader("인스타그램 ZIP 파일 업로드", type="zip")
 
 
-def extract_following_info(data):
-    results = []
-    if isinstance(data, dict):
-        for v in data.values():
-            if isinstance(v, list):
-                for entry in v:
-                    if "string_list_data" in entry:
-                        string_data = entry["string_list_data"][0]
-                        username = string_data.get("value")
-                        timestamp = string_data.get("timestamp")
-                        results.append({"username": username, "timestamp": timestamp})
-    elif isinstance(data, list):
-        for entry in data:
-            if "string_list_data" in entry:
-                string_data = entry["string_list_data"][0]
-                username = string_data.get("value")
-                timestamp = string_data.get("timestamp")
-                results.append({"username": username, "timestamp": timestamp})
-    return results
-
 def format_time(ts):
     if not ts:
         return "-"
@@ -87,86 +66,122 @@ def format_time(ts):
     formatted = dt.strftime("%Y.%m.%d %H:%M")
     return f"{delta_days}일 전, {formatted}"
 
-def find_json_file(zip_file, keyword):
-    files = [f for f in zip_file.namelist() if keyword in f and f.endswith(".json")]
-    if keyword == "followers":
-        files = [f for f in files if "followers_1.json" in f]
-    elif keyword == "following":
-        files = [f for f in files if f.endswith("following.json")]
-    return files[0] if files else None
+# ✅ ZIP 분석 결과 캐시 (업로드 내용 해시 기준, 정렬/다운로드 등 재실행 시 다시 읽지 않음)
+@st.cache_data(max_entries=8, ttl=3600, show_spinner="ZIP 파일 분석 중...")
+def analyze_zip(digest: str, _data: bytes):
+    with zipfile.ZipFile(io.BytesIO(_data)) as z:
+        followers_files = find_shards(z, FOLLOWER_SHARD)
+        following_files = find_shards(z, FOLLOWING_SHARD)
+        if not followers_files or not following_files:
+            return None
+
+        # 모든 샤드를 항목 단위로 읽어 팔로워는 집합에만, 팔로잉은 언팔로워만 남김
+        follower_usernames = {username for username, _ in iter_relations(z, followers_files)}
+
+        results = []
+        following_usernames = []
+        for username, timestamp in iter_relations(z, following_files):
+            following_usernames.append(username)
+            if username not in follower_usernames:
+                results.append({
+                    "ID": f"@{username}",
+                    "링크": f"https://instagram.com/{username}",
+                    "내가 팔로잉한 날짜": format_time(timestamp),
+                    "timestamp_raw": timestamp or 0
+                })
+
+    result_df = pd.DataFrame(results, columns=["ID", "링크", "내가 팔로잉한 날짜", "timestamp_raw"])
+    return (
+        follower_usernames, following_usernames,
+        hash_names(follower_usernames), hash_names(following_usernames), result_df,
+    )
 
 if uploaded_zip:
     try:
-        with zipfile.ZipFile(uploaded_zip) as z:
-            followers_file = find_json_file(z, "followers")
-            following_file = find_json_file(z, "following")
-
-            if not followers_file or not following_file:
-                st.error("ZIP 파일에서 followers 또는 following JSON 파일을 찾을 수 없습니다.")
-            else:
-                with z.open(followers_file) as f:
-                    followers_data = json.load(f)
-                with z.open(following_file) as f:
-                    following_data = json.load(f)
-
-                follower_usernames = set([entry["username"] for entry in extract_following_info(followers_data)])
-                following_info = extract_following_info(following_data)
-
-                results = []
-                for entry in following_info:
-                    username = entry["username"]
-                    timestamp = entry["timestamp"]
-                    if username not in follower_usernames:
-                        results.append({
-                            "ID": f"@{username}",
-                            "링크": f"https://instagram.com/{username}",
-                            "내가 팔로잉한 날짜": format_time(timestamp),
-                            "timestamp_raw": timestamp or 0
-                        })
-
-                st.success(f"총 {len(results)}명이 나를 팔로우하지 않아요.")
-
-                # 정렬 옵션
-                sort_order = st.radio("정렬 순서 선택", ["최신순", "오래된순"], horizontal=True)
-                results = sorted(results, key=lambda x: x["timestamp_raw"], reverse=(sort_order == "최신순"))
-
-                # 웹용 테이블 출력
-                display_df = pd.DataFrame(results)
-                display_df["ID"] = display_df.apply(
-                    lambda row: f'<a href="{row["링크"]}" target="_blank">{row["ID"]}</a>', axis=1
-                )
-                st.write("#### 결과:", unsafe_allow_html=True)
-                st.write(
-                    display_df[["ID", "내가 팔로잉한 날짜"]]
-                    .to_html(escape=False, index=False, justify="left"),
-                    unsafe_allow_html=True
-                )
-
-                # XLSX 다운로드 (하이퍼링크 포함)
-                df_export = pd.DataFrame(results)[["ID", "링크", "내가 팔로잉한 날짜"]]
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                ws.title = "Unfollow Check"
-
-                ws.append(["ID", "내가 팔로잉한 날짜"])
-
-                for i in range(len(df_export)):
-                    id_cell = ws.cell(row=i+2, column=1, value=df_export.iloc[i]["ID"])
-                    id_cell.hyperlink = df_export.iloc[i]["링크"]
-                    id_cell.style = "Hyperlink"
-                    date_cell = ws.cell(row=i+2, column=2, value=df_export.iloc[i]["내가 팔로잉한 날짜"])
-
-                for col in ws.columns:
-                    for cell in col:
-                        cell.alignment = Alignment(horizontal="left")
-
-                output = BytesIO()
-                wb.save(output)
-                st.download_button(
-                    label="📅 엑셀파일 다운로드",
-                    data=output.getvalue(),
-                    file_name="제니앱_인스타_언팔체크.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+        zip_data = read_bytes(uploaded_zip)
+        zip_digest = content_hash(zip_data)
+        analysis = analyze_zip(zip_digest, zip_data)
+
+        if analysis is None:
+            st.error("ZIP 파일에서 followers 또는 following JSON 파일을 찾을 수 없습니다.")
+        else:
+            follower_usernames, following_usernames, follower_hashes, following_hashes, result_df = analysis
+
+            st.success(f"총 {len(result_df)}명이 나를 팔로우하지 않아요.")
+
+            # 정렬 옵션 (표 전체는 timestamp 열 기준으로 서버에서 정렬)
+            sort_order = st.radio("정렬 순서 선택", ["최신순", "오래된순"], horizontal=True)
+            result_df = result_df.sort_values(
+                "timestamp_raw", ascending=(sort_order == "오래된순"), kind="stable"
+            ).reset_index(drop=True)
+
+            # 웹용 테이블 출력 (현재 페이지만 HTML로 변환, 링크는 열 단위 문자열 연결)
+            start, stop = page_controls("unfollow", len(result_df))
+            page_df = result_df.iloc[start:stop]
+            links = '<a href="' + page_df["링크"] + '" target="_blank">' + page_df["ID"] + '</a>'
+            st.write("#### 결과:", unsafe_allow_html=True)
+            st.write(
+                pd.DataFrame({"ID": links, "내가 팔로잉한 날짜": page_df["내가 팔로잉한 날짜"]})
+                .to_html(escape=False, index=False, justify="left"),
+                unsafe_allow_html=True
+            )
+            st.caption(f"전체 {len(result_df):,}명 중 {start + 1 if stop else 0:,}–{stop:,}번째")
+
+            # 다운로드 파일은 버튼을 눌렀을 때만 생성 (엑셀은 하이퍼링크 포함)
+            df_export = result_df[["ID", "링크", "내가 팔로잉한 날짜"]]
+            export_menu(
+                "check",
+                {
+                    "xlsx": lambda: hyperlink_xlsx(
+                        df_export["ID"].tolist(), df_export["링크"].tolist(),
+                        {"내가 팔로잉한 날짜": df_export["내가 팔로잉한 날짜"].tolist()},
+                        "Unfollow Check", header=["ID", "내가 팔로잉한 날짜"],
+                    ),
+                    "csv": lambda: csv_bytes(df_export),
+                    "parquet": lambda: parquet_bytes(df_export),
+                },
+                "제니앱_인스타_언팔체크",
+                token=f"{zip_digest}|{sort_order}",
+            )
+
+            # ✅ 이전 업로드와 비교 (계정 이름 + 비밀번호를 입력한 경우에만 해시 스냅샷 저장)
+            #   기록은 비밀번호로 구분되어 계정 이름만 아는 다른 사람은 볼 수도, 덧붙일 수도 없음
+            st.markdown("---\n#### 📸 이전 업로드와 비교")
+            col1, col2 = st.columns(2)
+            account = col1.text_input("내 인스타그램 계정 이름")
+            secret = col2.text_input(
+                f"비교용 비밀번호 ({MIN_SECRET}자 이상, 처음 저장할 때 정한 비밀번호를 계속 사용)", type="password",
+            )
+            if account.strip() and len(secret) < MIN_SECRET:
+                st.info(f"이번 업로드를 저장하고 이전 업로드와 비교하려면 비밀번호를 {MIN_SECRET}자 이상 입력하세요.")
+            elif account.strip():
+                # 가장 최근 기록과 같은 계정으로 볼 수 있을 때만 이번 업로드를 기록에 추가
+                previous = STORE.previous(account, secret, zip_digest)
+                if not previous or same_owner(STORE.load(previous[0]), following_hashes):
+                    STORE.save(account, secret, zip_digest, follower_hashes, following_hashes)
+                else:
+                    st.warning("이번 업로드는 저장된 기록과 팔로잉 목록이 거의 겹치지 않아 같은 계정으로 볼 수 없어 저장하지 않았어요.")
+
+                if not previous:
+                    st.info("저장된 이전 업로드가 없습니다. 다음 업로드부터 변화를 비교할 수 있어요.")
+                else:
+                    path = st.selectbox(
+                        "비교할 업로드", previous,
+                        format_func=lambda p: datetime.datetime.fromtimestamp(int(p.stem.split("-")[0])).strftime("%Y.%m.%d %H:%M"),
+                    )
+                    changes = diff(STORE.load(path), follower_hashes, following_hashes)
+                    if not changes.same_owner:
+                        st.warning("선택한 업로드와 이번 업로드의 팔로잉 목록이 거의 겹치지 않아 같은 계정으로 볼 수 없습니다. 비교하지 않았어요.")
+                    else:
+                        lost, unknown = resolve(changes.lost_followers, following_usernames)
+                        gained, _ = resolve(changes.new_followers, follower_usernames)
+
+                        col1, col2 = st.columns(2)
+                        col1.metric("새로 나를 언팔한 계정", f"{len(changes.lost_followers):,}명")
+                        col2.metric("새로 나를 팔로우한 계정", f"{len(changes.new_followers):,}명")
+                        col1.write("\n".join(f"- [@{name}](https://instagram.com/{name})" for name in lost))
+                        if unknown:
+                            col1.caption(f"내가 팔로우하지 않는 {unknown:,}명은 이름을 확인할 수 없어요 (이름은 저장하지 않음).")
+                        col2.write("\n".join(f"- [@{name}](https://instagram.com/{name})" for name in gained))
     except Exception as e:
         st.error(f"처리 중 오류 발생: {e}")
@@ -0,0 +1,252 @@
+# reconcile.py - KZ / SNC 정산 대사 엔진 (MBL별 금액을 다중집합으로 맞춰 건별 미대사 금액까지 산출)
+
+import re
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from workbook import Workbook
+
+KZ_MISSING = "KZ 미승인"
+SNC_MISSING = "SNC 미입력"
+MISMATCH = "금액 불일치"
+KZ_ONLY = "KZ만 있음"
+SNC_ONLY = "SNC만 있음"
+
+KZ_COLUMNS = ("M.BL#", "승인금액")
+SNC_COLUMNS = ("H.B/L NO", "Unnamed: 11")
+
+
+# ✅ 대사 결과
+#   summary   : 불일치/누락 MBL만 (MBL#, KZ건수, KZ합계, SNC건수, SNC합계, 차액, 비고)
+#   unmatched : 짝이 없는 금액 한 건씩 (MBL#, 구분, 금액)
+#   tolerance : 허용 오차 안에서 짝지은 금액 쌍 (MBL#, KZ금액, SNC금액, 차이)
+class Reconciliation(NamedTuple):
+    summary: pd.DataFrame
+    unmatched: pd.DataFrame
+    kz_total: float
+    snc_total: float
+    tolerance: pd.DataFrame
+
+
+# ✅ 원본 표 → (MBL, 금액) 표준 표 (MBL 없는 행 제외, 금액은 숫자가 아니면 0)
+#   MBL은 읽을 때 범주형으로 바꿔 문자열은 파일당 한 번만 보관하고 행에는 정수 코드만 둠
+def prepare(df: pd.DataFrame, mbl_column: str, amount_column: str) -> pd.DataFrame:
+    out = df[[mbl_column, amount_column]].copy()
+    out.columns = ["MBL", "금액"]
+    out = out.dropna(subset=["MBL"])
+    out["MBL"] = pd.Categorical(out["MBL"].astype(str).str.strip())
+    out["금액"] = pd.to_numeric(out["금액"], errors="coerce").fillna(0)
+    return out.reset_index(drop=True)
+
+
+# ✅ 엑셀 바이트 → 표준 (MBL, 금액) 표 (필요한 열이 없으면 None)
+def load_amounts(data: bytes, columns: tuple, digest: Optional[str] = None) -> Optional[pd.DataFrame]:
+    book = Workbook(data, digest)
+    try:
+        df = book.parse(0)
+    finally:
+        book.close()
+    if not set(columns).issubset(df.columns):
+        return None
+    return prepare(df, *columns)
+
+
+# ✅ 두 표의 MBL 사전을 합친 정렬 사전 + 그 사전 기준 정수 코드로 바꾼 두 표
+#   (사전끼리만 합치고 행은 get_indexer 결과로 코드만 바꿔 끼움, 코드 순서 = MBL 문자열 정렬 순서)
+def _shared_codes(kz: pd.DataFrame, snc: pd.DataFrame) -> tuple:
+    kz_mbl = kz["MBL"].astype("category").array
+    snc_mbl = snc["MBL"].astype("category").array
+    mbls = kz_mbl.categories.union(snc_mbl.categories)
+
+    def recode(values: pd.Categorical) -> np.ndarray:
+        return mbls.get_indexer(values.categories)[values.codes]
+
+    return mbls, kz.assign(MBL=recode(kz_mbl)), snc.assign(MBL=recode(snc_mbl))
+
+
+def _decode(mbls: pd.Index, codes) -> np.ndarray:
+    return mbls.take(np.asarray(codes, dtype=np.intp)).to_numpy()
+
+
+# ✅ 같은 (MBL, 금액)이 몇 번째로 나온 건인지 → (MBL, 금액, 순번)이 다중집합의 원소 키
+def _occurrences(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(순번=df.groupby(["MBL", "금액"], sort=False).cumcount())
+
+
+# ✅ 허용 오차 짝짓기: 양쪽 남은 금액을 (MBL, 금액) 순으로 정렬한 뒤 한 번만 훑는 투 포인터 방식 (정렬 O(n log n) + 순회 O(n))
+#   허용 범위(±N원 또는 KZ 금액의 ±p%)는 미리 한 번에 계산
+#   범위 안이어도 바로 옆 SNC / KZ 금액이 더 가까우면 그쪽으로 한 칸 전진 → 가장 가까운 금액끼리 짝지음 (merge_asof nearest와 같은 결과)
+def _tolerance_pairs(kz_left: pd.DataFrame, snc_left: pd.DataFrame, won: float, pct: float) -> tuple:
+    kz_left = kz_left.sort_values(["MBL", "금액"], kind="stable").reset_index(drop=True)
+    snc_left = snc_left.sort_values(["MBL", "금액"], kind="stable").reset_index(drop=True)
+    kz_mbl, kz_amount = kz_left["MBL"].tolist(), kz_left["금액"].tolist()
+    snc_mbl, snc_amount = snc_left["MBL"].tolist(), snc_left["금액"].tolist()
+    limits = np.maximum(won, np.abs(kz_left["금액"].to_numpy(dtype=float)) * pct / 100).tolist()
+
+    kz_hits, snc_hits = [], []
+    i = j = 0
+    while i < len(kz_mbl) and j < len(snc_mbl):
+        if kz_mbl[i] != snc_mbl[j]:
+            if kz_mbl[i] < snc_mbl[j]:
+                i += 1
+            else:
+                j += 1
+            continue
+        gap = kz_amount[i] - snc_amount[j]
+        if abs(gap) <= limits[i]:
+            # 다음 SNC가 이 KZ에 더 가까우면 현재 SNC는 뒤의 (더 큰) KZ에게도 더 멀기만 하므로 건너뜀
+            if j + 1 < len(snc_mbl) and snc_mbl[j + 1] == kz_mbl[i] and abs(kz_amount[i] - snc_amount[j + 1]) < abs(gap):
+                j += 1
+                continue
+            # 다음 KZ가 이 SNC에 더 가까우면 현재 KZ를 건너뜀 (같은 이유)
+            if i + 1 < len(kz_mbl) and kz_mbl[i + 1] == snc_mbl[j] and abs(kz_amount[i + 1] - snc_amount[j]) < abs(gap):
+                i += 1
+                continue
+            kz_hits.append(i)
+            snc_hits.append(j)
+            i += 1
+            j += 1
+        elif gap < 0:
+            i += 1
+        else:
+            j += 1
+
+    kz_pairs = kz_left.iloc[kz_hits].reset_index(drop=True)
+    snc_pairs = snc_left.iloc[snc_hits].reset_index(drop=True)
+    pairs = pd.DataFrame({
+        "MBL#": kz_pairs["MBL"],
+        "KZ금액": kz_pairs["금액"],
+        "SNC금액": snc_pairs["금액"],
+        "차이": kz_pairs["금액"] - snc_pairs["금액"],
+    })
+    return (
+        pairs,
+        kz_left.drop(index=kz_hits),
+        snc_left.drop(index=snc_hits),
+    )
+
+
+# ✅ tolerance_won / tolerance_pct가 0보다 크면 정확히 맞지 않은 금액끼리 ±N원 또는 ±p% 안에서 한 번 더 짝지음
+#   매칭 / 정렬 / 집계는 모두 MBL 정수 코드로 하고 결과 표를 만들 때만 문자열로 되돌림
+def reconcile(kz: pd.DataFrame, snc: pd.DataFrame, tolerance_won: float = 0, tolerance_pct: float = 0) -> Reconciliation:
+    mbls, kz, snc = _shared_codes(kz, snc)
+    merged = pd.merge(_occurrences(kz), _occurrences(snc), on=["MBL", "금액", "순번"], how="outer", indicator=True)
+    kz_left = merged.loc[merged["_merge"] == "left_only", ["MBL", "금액"]]
+    snc_left = merged.loc[merged["_merge"] == "right_only", ["MBL", "금액"]]
+
+    tolerance = pd.DataFrame(columns=["MBL#", "KZ금액", "SNC금액", "차이"])
+    if tolerance_won > 0 or tolerance_pct > 0:
+        tolerance, kz_left, snc_left = _tolerance_pairs(kz_left, snc_left, tolerance_won, tolerance_pct)
+
+    unmatched = pd.concat([kz_left.assign(구분=KZ_ONLY), snc_left.assign(구분=SNC_ONLY)])
+    unmatched = (
+        unmatched.rename(columns={"MBL": "MBL#"})[["MBL#", "구분", "금액"]]
+        .sort_values(["MBL#", "구분", "금액"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+    kz_stats = kz.groupby("MBL")["금액"].agg(KZ건수="size", KZ합계="sum")
+    snc_stats = snc.groupby("MBL")["금액"].agg(SNC건수="size", SNC합계="sum")
+    summary = kz_stats.join(snc_stats, how="outer")
+    summary = summary[summary.index.isin(unmatched["MBL#"])].sort_index()
+    summary[["KZ건수", "SNC건수"]] = summary[["KZ건수", "SNC건수"]].fillna(0).astype(int)
+    summary[["KZ합계", "SNC합계"]] = summary[["KZ합계", "SNC합계"]].fillna(0)
+    summary["차액"] = summary["KZ합계"] - summary["SNC합계"]
+    summary["비고"] = np.select(
+        [summary["KZ건수"] == 0, summary["SNC건수"] == 0], [KZ_MISSING, SNC_MISSING], MISMATCH,
+    )
+    summary = summary.rename_axis("MBL#").reset_index()
+
+    for frame in (summary, unmatched, tolerance):
+        frame["MBL#"] = _decode(mbls, frame["MBL#"])
+    return Reconciliation(summary, unmatched, float(kz["금액"].sum()), float(snc["금액"].sum()), tolerance)
+
+
+# ✅ 워커 프로세스용: KZ / SNC 엑셀 바이트 한 쌍을 읽어 대사 (필요한 열이 없으면 ValueError)
+def reconcile_files(kz_data: bytes, snc_data: bytes, tolerance_won: float = 0, tolerance_pct: float = 0) -> Reconciliation:
+    kz = load_amounts(kz_data, KZ_COLUMNS)
+    if kz is None:
+        raise ValueError("KZ 파일에 'M.BL#' 또는 '승인금액' 열이 없습니다.")
+    snc = load_amounts(snc_data, SNC_COLUMNS)
+    if snc is None:
+        raise ValueError("SNC 파일에 'H.B/L NO' 또는 'Unnamed: 11' 열이 없습니다.")
+    return reconcile(kz, snc, tolerance_won, tolerance_pct)
+
+
+# ✅ 파일 이름 규칙: 확장자와 "KZ"/"SNC" 표기, 구분 기호를 뺀 나머지가 같으면 한 쌍 (예: KZ_홍길동.xlsx ↔ SNC_홍길동.xlsx)
+_SIDE_TOKEN = re.compile(r"(?i)kz|snc")
+_SEPARATORS = re.compile(r"[\s_\-.()\[\]]+")
+
+
+def pair_key(name: str) -> str:
+    stem = name.rsplit(".", 1)[0]
+    return _SEPARATORS.sub("", _SIDE_TOKEN.sub("", stem)).lower()
+
+
+# ✅ 직접 지정: 한 줄에 "KZ파일명 = SNC파일명"
+def parse_mapping(text: str) -> dict:
+    mapping = {}
+    for line in (text or "").splitlines():
+        if "=" in line:
+            kz_name, snc_name = (part.strip() for part in line.split("=", 1))
+            if kz_name and snc_name:
+                mapping[kz_name] = snc_name
+    return mapping
+
+
+# ✅ (이름, KZ 파일, SNC 파일) 목록 + 짝이 없는 KZ / SNC 파일 (직접 지정이 이름 규칙보다 우선)
+def pair_files(kz_names: list, snc_names: list, mapping: dict = None) -> tuple:
+    pairs = []
+    kz_left, snc_left = list(kz_names), list(snc_names)
+    for kz_name, snc_name in (mapping or {}).items():
+        if kz_name in kz_left and snc_name in snc_left:
+            pairs.append((pair_key(kz_name) or kz_name, kz_name, snc_name))
+            kz_left.remove(kz_name)
+            snc_left.remove(snc_name)
+
+    snc_by_key = {}
+    for snc_name in snc_left:
+        snc_by_key.setdefault(pair_key(snc_name), snc_name)
+    for kz_name in list(kz_left):
+        snc_name = snc_by_key.pop(pair_key(kz_name), None)
+        if snc_name is not None:
+            pairs.append((pair_key(kz_name) or kz_name, kz_name, snc_name))
+            kz_left.remove(kz_name)
+            snc_left.remove(snc_name)
+    return pairs, kz_left, snc_left
+
+
+# ✅ 여러 쌍의 결과 → (쌍별 요약표, 통합 불일치표, 통합 미대사표, 통합 허용오차표), 각 표 앞에 "담당" 열
+#   results: [(이름, Reconciliation 또는 오류 메시지)]
+def consolidate(results: list) -> tuple:
+    overview, summaries, unmatched, tolerance = [], [], [], []
+    for label, result in results:
+        if not isinstance(result, Reconciliation):
+            overview.append({"담당": label, "오류": str(result)})
+            continue
+        overview.append({
+            "담당": label,
+            "KZ합계": result.kz_total,
+            "SNC합계": result.snc_total,
+            "차액": result.kz_total - result.snc_total,
+            "불일치 MBL": len(result.summary),
+            "미대사 금액": len(result.unmatched),
+            "허용오차 쌍": len(result.tolerance),
+            "오류": "",
+        })
+        summaries.append(result.summary.assign(담당=label))
+        unmatched.append(result.unmatched.assign(담당=label))
+        tolerance.append(result.tolerance.assign(담당=label))
+
+    def combined(frames: list) -> pd.DataFrame:
+        if not frames:
+            return pd.DataFrame(columns=["담당"])
+        frame = pd.concat(frames, ignore_index=True)
+        return frame[["담당", *[c for c in frame.columns if c != "담당"]]]
+
+    overview = pd.DataFrame(overview, columns=[
+        "담당", "KZ합계", "SNC합계", "차액", "불일치 MBL", "미대사 금액", "허용오차 쌍", "오류",
+    ])
+    return overview, combined(summaries), combined(unmatched), combined(tolerance)
@@ -1,5 +1,8 @@
-# shared.py (v8)
+# shared.py (v11)
 import streamlit as st
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 def show_menu(active_page: str):
     st.markdown("""
@@ -30,3 +33,48 @@ def show_menu(active_page: str):
     st.sidebar.page_link("pages/check.py", label="인스타 언팔체크", icon="📱")
     st.sidebar.page_link("pages/cards.py", label="카드값 계산기", icon="💳")
     st.sidebar.page_link("pages/audit.py", label="정산 도우미", icon="📊")
+
+# ✅ 서버 프로세스 전체가 공유하는 작업용 프로세스 풀
+# (Streamlit 서버는 스레드를 쓰므로 fork 대신 spawn으로 워커 생성)
+@st.cache_resource
+def process_pool() -> ProcessPoolExecutor:
+    workers = max(1, min(4, (os.cpu_count() or 1)))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+# ✅ 내보내기 형식별 표시 이름 / MIME
+EXPORT_FORMATS = {
+    "xlsx": ("엑셀 (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV (.csv)", "text/csv"),
+    "parquet": ("Parquet (.parquet)", "application/vnd.apache.parquet"),
+}
+
+# ✅ 요청할 때만 파일을 만드는 내보내기 메뉴
+# builders: 형식 → 바이트를 만드는 함수, token: 입력이 바뀌면 달라지는 값 (이전 결과물 재사용 방지)
+def export_menu(key: str, builders: dict, file_stem: str, token: str = ""):
+    fmt = st.radio(
+        "내보내기 형식", list(builders), horizontal=True, key=f"{key}_format",
+        format_func=lambda f: EXPORT_FORMATS[f][0],
+    )
+    state_key = f"{key}_export"
+    if st.button("📦 다운로드 파일 만들기", key=f"{key}_build"):
+        with st.spinner("파일 생성 중..."):
+            st.session_state[state_key] = {"id": (token, fmt), "data": builders[fmt]()}
+
+    ready = st.session_state.get(state_key)
+    if ready and ready["id"] == (token, fmt):
+        st.download_button(
+            label="📅 파일 다운로드",
+            data=ready["data"],
+            file_name=f"{file_stem}.{fmt}",
+            mime=EXPORT_FORMATS[fmt][1],
+            key=f"{key}_download",
+        )
+
+# ✅ 페이지 나누기 컨트롤 (전체 건수 → 현재 페이지 시작/끝 위치)
+def page_controls(key: str, total: int, sizes=(50, 100, 500)) -> tuple:
+    col1, col2 = st.columns(2)
+    page_size = col1.selectbox("페이지당 행 수", list(sizes), index=min(1, len(sizes) - 1), key=f"{key}_page_size")
+    pages = max(1, -(-total // page_size))
+    page = col2.number_input(f"페이지 (총 {pages}쪽)", min_value=1, value=1, step=1, key=f"{key}_page")
+    start = (min(int(page), pages) - 1) * page_size
+    return start, min(start + page_size, total)
@@ -0,0 +1,42 @@
+# statement_cache.py - 파싱된 카드 명세서 디스크 캐시 (파일 내용 해시 + 파서 버전 → Parquet)
+
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from disk_cache import DiskCache
+
+MAX_BYTES = 256 * 1024 * 1024
+ISSUER_KEY = b"jeniapp.issuer"
+
+_CACHE = DiskCache("statements", MAX_BYTES)
+
+
+def _key(digest: str, version) -> str:
+    return f"{digest}-v{version}"
+
+
+# ✅ 적중하면 (카드사, 표준 DataFrame) 반환 (메모리 매핑으로 읽기)
+def load(digest: str, version) -> Optional[tuple]:
+    path = _CACHE.get(_key(digest, version), ".parquet")
+    if path is None:
+        return None
+    try:
+        table = pq.read_table(str(path), memory_map=True)
+    except (OSError, pa.ArrowException) as e:
+        print("[ERROR] 명세서 캐시 읽기 실패:", e)
+        return None
+    issuer = (table.schema.metadata or {}).get(ISSUER_KEY, b"").decode("utf-8")
+    return issuer, table.to_pandas()
+
+
+def store(digest: str, version, issuer: str, df: pd.DataFrame):
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), ISSUER_KEY: issuer.encode("utf-8")})
+        _CACHE.put(_key(digest, version), ".parquet", lambda tmp: pq.write_table(table, str(tmp)))
+    except (OSError, pa.ArrowException) as e:
+        # 숫자/문자 혼합 열 등 저장할 수 없는 경우 캐시 없이 진행
+        print("[ERROR] 명세서 캐시 저장 실패:", e)
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from reconcile import KZ_ONLY, SNC_ONLY, prepare, reconcile
+
+
+def amounts(mbls, values):
+    return prepare(pd.DataFrame({"MBL": mbls, "금액": values}), "MBL", "금액")
+
+
+def test_tolerance_pairs_nearest_snc_amount():
+    result = reconcile(amounts(["A"], [100]), amounts(["A", "A"], [96, 99]), tolerance_won=5)
+    assert result.tolerance[["MBL#", "KZ금액", "SNC금액"]].values.tolist() == [["A", 100, 99]]
+    assert result.unmatched.values.tolist() == [["A", SNC_ONLY, 96]]
+
+
+def test_tolerance_pairs_nearest_kz_amount():
+    result = reconcile(amounts(["A", "A"], [96, 99]), amounts(["A"], [100]), tolerance_won=5)
+    assert result.tolerance[["MBL#", "KZ금액", "SNC금액"]].values.tolist() == [["A", 99, 100]]
+    assert result.unmatched.values.tolist() == [["A", KZ_ONLY, 96]]
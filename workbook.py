@@ -0,0 +1,176 @@
+# workbook.py - 업로드 엑셀 핸들 (인식/파싱 동안 파일당 1회만 읽기, 읽기 엔진 선택)
+
+import datetime
+import hashlib
+import threading
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+# ✅ 업로드 파일 바이트 추출 (UploadedFile, BytesIO, bytes 모두 허용)
+def read_bytes(file) -> bytes:
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+# ✅ openpyxl 셀 값 변환 (pandas openpyxl 리더와 동일한 규칙)
+def _convert_cell(cell):
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+
+# ✅ calamine 셀 값 변환 (openpyxl 경로와 같은 값이 나오도록 맞춤)
+def _convert_calamine(value):
+    if isinstance(value, float):
+        val = int(value)
+        return val if val == value else value
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+
+def _trim(row: list) -> list:
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+# ✅ 읽기 엔진: openpyxl (기본, 읽기 전용 모드)
+class OpenpyxlReader:
+    def __init__(self, data: bytes):
+        from openpyxl import load_workbook
+        self.book = load_workbook(BytesIO(data), read_only=True, data_only=True, keep_links=False)
+        self.sheet_names = self.book.sheetnames
+
+    def iter_rows(self, name: str, limit: Optional[int] = None):
+        ws = self.book[name]
+        ws.reset_dimensions()
+        for row in ws.iter_rows(max_row=limit):
+            yield _trim([_convert_cell(cell) for cell in row])
+
+    def close(self):
+        self.book.close()
+
+
+# ✅ 읽기 엔진: calamine (Rust 기반, python-calamine 설치 시)
+class CalamineReader:
+    def __init__(self, data: bytes):
+        from python_calamine import CalamineWorkbook
+        self.book = CalamineWorkbook.from_filelike(BytesIO(data))
+        self.sheet_names = self.book.sheet_names
+
+    def iter_rows(self, name: str, limit: Optional[int] = None):
+        # skip_empty_area=False → A1부터 읽어 행 번호를 openpyxl과 동일하게 유지
+        sheet = self.book.get_sheet_by_name(name)
+        for row in sheet.to_python(skip_empty_area=False, nrows=limit):
+            yield _trim([_convert_calamine(v) for v in row])
+
+    def close(self):
+        if hasattr(self.book, "close"):
+            self.book.close()
+
+
+READERS = {"openpyxl": OpenpyxlReader, "calamine": CalamineReader}
+
+
+# ✅ 기본 엔진은 openpyxl 고정 (calamine은 benchmarks/bench_readers.py로 결과 동일성을 확인한 뒤에만 기본값으로 전환)
+ENGINE = "openpyxl"
+
+
+# ✅ 업로드 파일 하나의 시트 원본 행을 한 번만 읽어 두고 인식/파싱이 함께 쓰는 핸들
+#   처리 1건 동안만 쓰고 close()로 읽은 행과 엔진을 바로 해제 (세션 간 공유 캐시 없음)
+class Workbook:
+    def __init__(self, data: bytes, digest: Optional[str] = None, engine: Optional[str] = None):
+        self.data = data
+        self.digest = digest or content_hash(data)
+        self.engine = engine or ENGINE
+        self._reader = None
+        self._rows = {}
+        self._lock = threading.RLock()
+
+    # ✅ 읽기 엔진 (지연 로딩)
+    @property
+    def reader(self):
+        with self._lock:
+            if self._reader is None:
+                self._reader = READERS[self.engine](self.data)
+            return self._reader
+
+    @property
+    def sheet_names(self) -> list:
+        return self.reader.sheet_names
+
+    def _sheet_name(self, sheet) -> str:
+        return self.sheet_names[sheet] if isinstance(sheet, int) else sheet
+
+    # ✅ 시트 전체 행 (최초 1회만 파싱, 이후 재사용)
+    def rows(self, sheet=0) -> list:
+        with self._lock:
+            return self._load_rows(self._sheet_name(sheet))
+
+    def _load_rows(self, name: str) -> list:
+        if name not in self._rows:
+            data = []
+            last_row_with_data = -1
+            for row_number, row in enumerate(self.reader.iter_rows(name)):
+                if row:
+                    last_row_with_data = row_number
+                data.append(row)
+            data = data[:last_row_with_data + 1]
+            if data:
+                max_width = max(len(r) for r in data)
+                data = [r + [""] * (max_width - len(r)) for r in data]
+            self._rows[name] = data
+        return self._rows[name]
+
+    # ✅ 헤더 탐색용 스트리밍 (앞쪽 limit행만 읽고 DataFrame은 만들지 않음)
+    #   읽는 동안 잠금을 유지해 다른 스레드의 close()와 겹치지 않게 함
+    def iter_rows(self, sheet=0, limit: Optional[int] = None):
+        with self._lock:
+            name = self._sheet_name(sheet)
+            cached = self._rows.get(name)
+            if cached is not None:
+                yield from (cached if limit is None else cached[:limit])
+                return
+            yield from self.reader.iter_rows(name, limit)
+
+    # ✅ pd.ExcelFile.parse 대응 (header / skiprows 의미 동일)
+    def parse(self, sheet_name=0, header=0, skiprows=None) -> pd.DataFrame:
+        data = self.rows(sheet_name)
+        if not data:
+            return pd.DataFrame()
+        try:
+            parser = TextParser(data, header=header, skiprows=skiprows, skip_blank_lines=False)
+            return parser.read()
+        except EmptyDataError:
+            return pd.DataFrame()
+
+    def close(self):
+        with self._lock:
+            self._rows.clear()
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+